@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Typed column pipeline for OpenKPIs Excel converters
+
+Declares how each spreadsheet column is stored in the generated YAML files
+instead of guessing from the cell contents:
+
+- json:  JSON blobs (XDM mappings, example payloads), emitted as real YAML mappings
+- json5: JavaScript-style object literals (unquoted keys, comments, trailing commas)
+- sql:   SQL snippets, emitted as block literals
+- list:  comma-separated values, emitted as YAML lists
+- text:  everything else, kept as a single string
+
+Structured blobs repeat heavily across rows and sheets, so they are parsed once
+per unique blob (keyed by hash). JSON5 parsing is pure Python and is spread over
+a process pool when there is enough of it to outweigh the pool start-up cost.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+JSON = 'json'
+JSON5 = 'json5'
+SQL = 'sql'
+LIST = 'list'
+TEXT = 'text'
+
+STRUCTURED_TYPES = (JSON, JSON5)
+
+# Column declarations keyed by normalized column name (see normalize_column)
+COLUMN_TYPES = {
+    # Structured mappings and examples
+    'data_layer_mapping': JSON5,
+    'xdm_mapping': JSON,
+    'ga4_params_map': JSON5,
+    'adobe_xdm_map': JSON5,
+    'adobe_acdl_map': JSON5,
+    'example_generic_json': JSON,
+    'example_ga4_json': JSON,
+    'example_xdm_json': JSON,
+    'example_acdl_json': JSON,
+
+    # SQL snippets
+    'sql_query_example': SQL,
+
+    # Comma-separated lists
+    'kpi_alias': LIST,
+    'event_alias': LIST,
+    'dimension_alias': LIST,
+    'alias': LIST,
+    'aliases': LIST,
+    'keywords': LIST,
+    'ga_events_name': LIST,
+    'adobe_analytics_event_name': LIST,
+    'amplitude_event_name': LIST,
+    'industry': LIST,
+    'related_kpis': LIST,
+    'bi_source_system': LIST,
+    'report_attribute': LIST,
+    'aggregation_window': LIST,
+    'dimensions': LIST,
+    'dimensions_related': LIST,
+    'required_on_events': LIST,
+    'join_keys': LIST,
+    'sample_values': LIST,
+    'generic_context_required': LIST,
+    'generic_context_optional': LIST,
+    'primary_kpis': LIST,
+    'secondary_kpis': LIST,
+    'metrics_used': LIST,
+    'dimensions_used': LIST,
+    'required_fields': LIST,
+    'xdm_field_groups': LIST,
+    'tags': LIST,
+}
+
+# Pending JSON5 text (bytes) below which a process pool is not worth starting.
+# The lenient parser runs at roughly 0.5 us/byte, while starting a pool costs
+# ~20 ms with fork and 100+ ms with spawn, so a pool only pays off for several
+# hundred KB of blobs. Strict JSON (C json.loads) is always parsed in-process.
+POOL_MIN_BYTES = 512 * 1024
+
+_LANGUAGE_PREFIX = re.compile(r'^\s*(?:json|sql)(?=\s|<br)', re.IGNORECASE)
+_BR_TAG = re.compile(r'<br\s*/?>', re.IGNORECASE)
+
+
+def normalize_column(name: str) -> str:
+    """Normalize a column name so 'Data Layer Mapping' and 'data_layer_mapping' match"""
+    return re.sub(r'[^a-z0-9]+', '_', str(name).lower()).strip('_')
+
+
+def column_type(name: str) -> str:
+    """Get the declared type of a column, defaulting to plain text"""
+    return COLUMN_TYPES.get(normalize_column(name), TEXT)
+
+
+def blob_hash(kind: str, raw: str) -> str:
+    """Cache key for a structured blob"""
+    return hashlib.sha1(f"{kind}\0{raw}".encode('utf-8')).hexdigest()
+
+
+def clean_code_text(value: str) -> str:
+    """Strip the 'json'/'sql' language tag and turn <br> markup into real newlines"""
+    value = _LANGUAGE_PREFIX.sub('', value, count=1)
+    value = _BR_TAG.sub('\n', value)
+    lines = [line.rstrip() for line in value.replace('\r\n', '\n').split('\n')]
+    return '\n'.join(lines).strip()
+
+
+class _Json5Parser:
+    """
+    Lenient parser for JavaScript-style object literals
+
+    Accepts unquoted keys (including dotted paths like commerce.order.priceTotal),
+    single-quoted strings, // and /* */ comments, trailing commas and bare
+    identifiers as values (kept as strings). Skipped comments are recorded in
+    has_comments so callers can avoid dropping them.
+    """
+
+    # Leading zeros are rejected so postal codes and SKUs like 02134 stay strings
+    _NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d*)?(?:[eE][+-]?\d+)?$')
+    _VALUE_STOP = ',:{}[]"\'\n'
+    _KEY_STOP = ',:{}"\'\n'
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.has_comments = False
+
+    def parse(self) -> Any:
+        value = self._value()
+        self._skip()
+        if self.pos != len(self.text):
+            raise ValueError(f"Unexpected trailing content at offset {self.pos}")
+        return value
+
+    def _skip(self):
+        text = self.text
+        while self.pos < len(text):
+            if text[self.pos].isspace():
+                self.pos += 1
+            elif text.startswith('//', self.pos):
+                self.has_comments = True
+                end = text.find('\n', self.pos)
+                self.pos = len(text) if end == -1 else end + 1
+            elif text.startswith('/*', self.pos):
+                self.has_comments = True
+                end = text.find('*/', self.pos + 2)
+                if end == -1:
+                    raise ValueError("Unterminated comment")
+                self.pos = end + 2
+            else:
+                break
+
+    def _peek(self) -> str:
+        self._skip()
+        if self.pos >= len(self.text):
+            raise ValueError("Unexpected end of input")
+        return self.text[self.pos]
+
+    def _value(self) -> Any:
+        char = self._peek()
+        if char == '{':
+            return self._object()
+        if char == '[':
+            return self._array()
+        if char in '"\'':
+            return self._string()
+        return self._bare()
+
+    def _object(self) -> Dict[str, Any]:
+        self.pos += 1
+        result = {}
+        while self._peek() != '}':
+            key = self._string() if self._peek() in '"\'' else self._bare_text(self._KEY_STOP)
+            if self._peek() != ':':
+                raise ValueError(f"Expected ':' at offset {self.pos}")
+            self.pos += 1
+            result[str(key)] = self._value()
+            if self._peek() == ',':
+                self.pos += 1
+            elif self._peek() != '}':
+                raise ValueError(f"Expected ',' or '}}' at offset {self.pos}")
+        self.pos += 1
+        return result
+
+    def _array(self) -> List[Any]:
+        self.pos += 1
+        result = []
+        while self._peek() != ']':
+            result.append(self._value())
+            if self._peek() == ',':
+                self.pos += 1
+            elif self._peek() != ']':
+                raise ValueError(f"Expected ',' or ']' at offset {self.pos}")
+        self.pos += 1
+        return result
+
+    def _string(self) -> str:
+        quote = self.text[self.pos]
+        if quote == '"':
+            value, end = json.JSONDecoder().raw_decode(self.text, self.pos)
+            self.pos = end
+            return value
+        end = self.text.find(quote, self.pos + 1)
+        if end == -1:
+            raise ValueError("Unterminated string")
+        value = self.text[self.pos + 1:end]
+        self.pos = end + 1
+        return value
+
+    def _bare_text(self, stop: str) -> str:
+        start = self.pos
+        while self.pos < len(self.text) and self.text[self.pos] not in stop:
+            if self.text.startswith('//', self.pos) or self.text.startswith('/*', self.pos):
+                break
+            self.pos += 1
+        token = self.text[start:self.pos].strip()
+        if not token:
+            raise ValueError(f"Expected a value at offset {start}")
+        return token
+
+    def _bare(self) -> Any:
+        token = self._bare_text(self._VALUE_STOP)
+        if token in ('true', 'false'):
+            return token == 'true'
+        if token == 'null':
+            return None
+        if self._NUMBER.match(token):
+            return float(token) if any(c in token for c in '.eE') else int(token)
+        return token
+
+
+def _usable_cpus() -> int:
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def _reject_constant(name: str):
+    raise ValueError(f"Non-standard JSON constant: {name}")
+
+
+def parse_blob(item: Tuple[str, str]) -> Optional[Any]:
+    """
+    Parse and canonicalize a structured blob
+
+    Args:
+        item: (column type, raw cell text) pair
+
+    Returns:
+        Parsed dict/list, or None if the blob is not a valid object or array
+        for its declared type, is nested too deeply, or contains comments that
+        a YAML mapping could not keep
+    """
+    kind, raw = item
+    text = clean_code_text(raw)
+    if not text.startswith(('{', '[')):
+        return None
+    if kind == JSON:
+        # Malformed JSON is kept verbatim rather than "repaired" by the lenient parser
+        try:
+            return json.loads(text, parse_constant=_reject_constant)
+        except (ValueError, RecursionError):
+            return None
+    parser = _Json5Parser(text)
+    try:
+        value = parser.parse()
+    except (ValueError, RecursionError):
+        return None
+    # Comments are implementation guidance; keep the blob as text instead of dropping them
+    return None if parser.has_comments else value
+
+
+class _BlockStyleDumper(yaml.SafeDumper):
+    """YAML dumper that writes multi-line strings as block literals"""
+
+    def ignore_aliases(self, data):
+        # Cached blobs are shared objects; never emit anchors for them
+        return True
+
+
+def _represent_str(dumper, data):
+    if '\n' in data:
+        return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
+    return dumper.represent_scalar('tag:yaml.org,2002:str', data)
+
+
+_BlockStyleDumper.add_representer(str, _represent_str)
+
+
+def dump_yaml(data: Dict[str, Any], stream) -> None:
+    """Write a converted row using block literals for code and multi-line text"""
+    yaml.dump(data, stream, Dumper=_BlockStyleDumper, default_flow_style=False,
+              allow_unicode=True, sort_keys=False)
+
+
+class ColumnPipeline:
+    """Converts spreadsheet rows to YAML-ready dicts using the column declarations"""
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Initialize the pipeline
+
+        Args:
+            workers: Process pool size for JSON5 parsing (defaults to usable CPUs)
+        """
+        self.workers = workers or _usable_cpus()
+        self.cache: Dict[str, Optional[Any]] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the process pool, if one was started"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @staticmethod
+    def _clean(value: Any) -> Any:
+        """Drop empty cells and strip strings"""
+        if value is None or (isinstance(value, float) and value != value):
+            return None
+        if isinstance(value, str):
+            value = value.strip()
+            return value or None
+        return value
+
+    def _pending_blobs(self, rows: List[Dict[str, Any]]) -> Dict[str, Tuple[str, str]]:
+        pending = {}
+        for row in rows:
+            for column, value in row.items():
+                kind = column_type(column)
+                value = self._clean(value)
+                if kind in STRUCTURED_TYPES and isinstance(value, str):
+                    key = blob_hash(kind, value)
+                    if key not in self.cache:
+                        pending[key] = (kind, value)
+        return pending
+
+    def parse_blobs(self, rows: List[Dict[str, Any]]) -> None:
+        """Parse every uncached structured blob in the rows, in parallel when worthwhile"""
+        pending = self._pending_blobs(rows)
+        if not pending:
+            return
+
+        pooled = {key: item for key, item in pending.items() if item[0] == JSON5}
+        if sum(len(raw) for _, raw in pooled.values()) < POOL_MIN_BYTES:
+            pooled = {}
+        if pooled and self.workers > 1:
+            self.cache.update(self._parse_in_pool(pooled))
+
+        for key, item in pending.items():
+            if key not in self.cache:
+                self.cache[key] = parse_blob(item)
+        logger.debug(f"Parsed {len(pending)} structured blobs ({len(self.cache)} cached)")
+
+    def _parse_in_pool(self, pooled: Dict[str, Tuple[str, str]]) -> Dict[str, Optional[Any]]:
+        """Parse blobs in the shared process pool, or return nothing if it is unavailable"""
+        keys = list(pooled)
+        items = [pooled[key] for key in keys]
+        try:
+            if self._executor is None:
+                # One pool per pipeline, reused across sheets
+                self._executor = ProcessPoolExecutor(max_workers=min(self.workers, len(items)))
+            chunksize = max(1, len(items) // (self.workers * 4))
+            return dict(zip(keys, self._executor.map(parse_blob, items, chunksize=chunksize)))
+        except (BrokenProcessPool, OSError) as e:
+            # Sandboxed hosts may not allow worker processes; parse in-process from now on
+            logger.warning(f"Process pool unavailable ({e}), parsing blobs serially")
+            self.close()
+            self.workers = 1
+            return {}
+
+    def convert_value(self, column: str, value: Any) -> Any:
+        """Convert a single cell according to its column type"""
+        value = self._clean(value)
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            if isinstance(value, (bool, int, float, list, dict)):
+                return value
+            return str(value)
+
+        kind = column_type(column)
+        if kind in STRUCTURED_TYPES:
+            key = blob_hash(kind, value)
+            if key not in self.cache:
+                self.cache[key] = parse_blob((kind, value))
+            parsed = self.cache[key]
+            # Blobs that are not valid objects are kept verbatim as text
+            return parsed if parsed is not None else clean_code_text(value)
+        if kind == SQL:
+            return clean_code_text(value)
+        if kind == LIST and ',' in value:
+            return [item.strip() for item in value.split(',') if item.strip()]
+        return value
+
+    def convert_rows(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert spreadsheet rows to YAML-ready dicts
+
+        Args:
+            rows: Rows as {column: cell value} dicts, e.g. DataFrame.to_dict('records')
+
+        Returns:
+            One dict per row with empty cells dropped
+        """
+        rows = list(rows)
+        self.parse_blobs(rows)
+
+        converted = []
+        for row in rows:
+            data = {}
+            for column, value in row.items():
+                converted_value = self.convert_value(column, value)
+                if converted_value is not None:
+                    data[column] = converted_value
+            converted.append(data)
+        return converted
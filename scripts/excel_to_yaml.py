@@ -11,6 +11,7 @@ Usage:
 Features:
 - Converts Excel sheets to CSV files
 - Converts CSV files to YAML format matching existing structure
+- Emits JSON/SQL columns as YAML mappings and block literals (see column_types.py)
 - Supports dynamic sheet detection
 - Integrates with existing YAML-to-MDX generation system
 """
@@ -25,6 +26,8 @@ from typing import Dict, List, Any, Optional
 import argparse
 import logging
 
+from column_types import ColumnPipeline, dump_yaml
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -32,19 +35,23 @@ logger = logging.getLogger(__name__)
 class ExcelToYAMLConverter:
     """Main converter class for Excel to YAML transformation"""
     
-    def __init__(self, excel_path: str, project_root: str = None):
+    def __init__(self, excel_path: str, project_root: str = None, workers: int = None):
         """
         Initialize the converter
         
         Args:
             excel_path: Path to the Excel file
             project_root: Root directory of the OpenKPIs project
+            workers: Number of processes used to parse JSON/SQL columns
         """
         self.excel_path = Path(excel_path)
         self.project_root = Path(project_root) if project_root else Path.cwd()
         self.csv_dir = self.project_root / "csv"
         self.data_layer_dir = self.project_root / "data-layer"
         
+        # Typed column pipeline; the blob cache is shared across sheets
+        self.pipeline = ColumnPipeline(workers)
+        
         # Ensure directories exist
         self.csv_dir.mkdir(exist_ok=True)
         self.data_layer_dir.mkdir(exist_ok=True)
@@ -142,32 +149,11 @@ class ExcelToYAMLConverter:
             target_path = self.data_layer_dir / target_dir
             target_path.mkdir(exist_ok=True)
             
+            # Convert each row using the declared column types (JSON, SQL, lists, text)
+            rows = self.pipeline.convert_rows(df.astype(object).where(df.notna(), None).to_dict('records'))
+            
             # Process each row as a separate YAML file
-            for index, row in df.iterrows():
-                # Create YAML data structure using column names as keys
-                yaml_data = {}
-                
-                # Process each column
-                for column in df.columns:
-                    value = row[column]
-                    
-                    # Skip NaN values
-                    if pd.isna(value):
-                        continue
-                    
-                    # Convert string values
-                    if isinstance(value, str):
-                        value = value.strip()
-                        if not value:
-                            continue
-                    
-                    # Check if the value looks like a list (contains commas)
-                    if isinstance(value, str) and ',' in value:
-                        # Split by comma and clean up
-                        yaml_data[column] = [item.strip() for item in value.split(',') if item.strip()]
-                    else:
-                        yaml_data[column] = value
-                
+            for index, yaml_data in zip(df.index, rows):
                 # Generate filename from ID field or fallback to index
                 file_id = yaml_data.get(id_field, f"{sheet_name.lower()}_{index}")
                 # Clean filename (remove special characters, convert to lowercase)
@@ -178,7 +164,7 @@ class ExcelToYAMLConverter:
                 
                 # Write YAML file
                 with open(yaml_path, 'w', encoding='utf-8') as f:
-                    yaml.dump(yaml_data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+                    dump_yaml(yaml_data, f)
                 
                 logger.info(f"Created YAML file: {yaml_path}")
             
@@ -210,21 +196,22 @@ class ExcelToYAMLConverter:
             
             success_count = 0
             
-            # Process each sheet
-            for sheet_name in sheets:
-                logger.info(f"Processing sheet: {sheet_name}")
-                
-                # Convert to CSV
-                csv_path = self.excel_to_csv(sheet_name)
-                if csv_path is None:
-                    continue
-                
-                # Convert CSV to YAML
-                if self.csv_to_yaml(csv_path, sheet_name):
-                    success_count += 1
-                    logger.info(f"Successfully processed sheet: {sheet_name}")
-                else:
-                    logger.error(f"Failed to process sheet: {sheet_name}")
+            # Process each sheet (the pipeline's process pool is shared across sheets)
+            with self.pipeline:
+                for sheet_name in sheets:
+                    logger.info(f"Processing sheet: {sheet_name}")
+                    
+                    # Convert to CSV
+                    csv_path = self.excel_to_csv(sheet_name)
+                    if csv_path is None:
+                        continue
+                    
+                    # Convert CSV to YAML
+                    if self.csv_to_yaml(csv_path, sheet_name):
+                        success_count += 1
+                        logger.info(f"Successfully processed sheet: {sheet_name}")
+                    else:
+                        logger.error(f"Failed to process sheet: {sheet_name}")
             
             logger.info(f"Successfully processed {success_count}/{len(sheets)} sheets")
             return success_count > 0
@@ -366,6 +353,8 @@ def main():
     parser.add_argument('--project-root', help='Root directory of the OpenKPIs project')
     parser.add_argument('--skip-generation', action='store_true', 
                        help='Skip running the YAML-to-MDX generation script')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Number of processes used to parse JSON/SQL columns (default: CPU count)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
     
     args = parser.parse_args()
@@ -374,7 +363,7 @@ def main():
         logging.getLogger().setLevel(logging.DEBUG)
     
     # Initialize converter
-    converter = ExcelToYAMLConverter(args.excel_path, args.project_root)
+    converter = ExcelToYAMLConverter(args.excel_path, args.project_root, args.workers)
     
     # Process Excel file
     if not converter.process_excel_file():
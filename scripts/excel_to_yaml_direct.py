@@ -6,13 +6,15 @@ and preserving ALL Excel columns as YAML keys.
 """
 
 import pandas as pd
-import yaml
+import argparse
 import subprocess
 import logging
 from pathlib import Path
 import sys
 import re
 
+from column_types import ColumnPipeline, dump_yaml
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,11 +26,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class DirectExcelToYamlConverter:
-    def __init__(self, excel_path: str, project_root: Path):
+    def __init__(self, excel_path: str, project_root: Path, workers: int = None):
         self.excel_path = Path(excel_path)
         self.project_root = project_root
         self.data_layer_dir = project_root / 'data-layer'
         
+        # Typed column pipeline; the blob cache is shared across sheets
+        self.pipeline = ColumnPipeline(workers)
+        
         # Ensure data-layer directory exists
         self.data_layer_dir.mkdir(exist_ok=True)
         
@@ -84,26 +89,6 @@ class DirectExcelToYamlConverter:
             
         return name
 
-    def convert_list_values(self, value):
-        """Convert comma-separated strings to lists, handle other data types"""
-        if pd.isna(value):
-            return None
-            
-        if isinstance(value, str):
-            value = value.strip()
-            if not value:
-                return None
-            # If string contains commas, treat as list
-            if ',' in value and not (value.startswith('{') and value.endswith('}')):
-                return [item.strip() for item in value.split(',') if item.strip()]
-            return value
-        elif isinstance(value, (int, float)):
-            return value
-        elif isinstance(value, list):
-            return value
-        else:
-            return str(value)
-
     def excel_to_yaml_direct(self, sheet_name: str) -> bool:
         """
         Convert Excel sheet directly to YAML files using actual names for file naming
@@ -128,17 +113,11 @@ class DirectExcelToYamlConverter:
             target_path = self.data_layer_dir / target_dir
             target_path.mkdir(parents=True, exist_ok=True)
             
+            # Convert all columns to YAML keys using the declared column types
+            rows = self.pipeline.convert_rows(df.astype(object).where(df.notna(), None).to_dict('records'))
+            
             # Process each row
-            for index, row in df.iterrows():
-                yaml_data = {}
-                
-                # Convert all columns to YAML keys
-                for column in df.columns:
-                    value = row[column]
-                    converted_value = self.convert_list_values(value)
-                    if converted_value is not None:
-                        yaml_data[column] = converted_value
-                
+            for index, yaml_data in zip(df.index, rows):
                 # Determine filename using the name field
                 name_value = yaml_data.get(name_field) or yaml_data.get(fallback_name_field)
                 if name_value:
@@ -154,7 +133,7 @@ class DirectExcelToYamlConverter:
                 
                 # Write YAML file
                 with open(yaml_path, 'w', encoding='utf-8') as f:
-                    yaml.dump(yaml_data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+                    dump_yaml(yaml_data, f)
                 
                 logger.info(f"Created YAML file: {yaml_path} (from row {index})")
                 
@@ -212,13 +191,15 @@ class DirectExcelToYamlConverter:
             return False
 
         success_count = 0
-        for sheet_name in sheets:
-            logger.info(f"Processing sheet: {sheet_name}")
-            if self.excel_to_yaml_direct(sheet_name):
-                success_count += 1
-                logger.info(f"Successfully processed sheet: {sheet_name}")
-            else:
-                logger.error(f"Failed to process sheet: {sheet_name}")
+        # The pipeline's process pool is shared across sheets
+        with self.pipeline:
+            for sheet_name in sheets:
+                logger.info(f"Processing sheet: {sheet_name}")
+                if self.excel_to_yaml_direct(sheet_name):
+                    success_count += 1
+                    logger.info(f"Successfully processed sheet: {sheet_name}")
+                else:
+                    logger.error(f"Failed to process sheet: {sheet_name}")
 
         logger.info(f"Successfully processed {success_count}/{len(sheets)} sheets")
         
@@ -232,14 +213,15 @@ class DirectExcelToYamlConverter:
             return False
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python excel_to_yaml_direct.py <excel_file_path>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description='Convert Excel sheets directly to YAML for OpenKPIs')
+    parser.add_argument('excel_path', help='Path to the Excel file')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of processes used to parse JSON/SQL columns (default: CPU count)')
+    args = parser.parse_args()
 
-    excel_file_path = sys.argv[1]
     project_root = Path.cwd()
     
-    converter = DirectExcelToYamlConverter(excel_file_path, project_root)
+    converter = DirectExcelToYamlConverter(args.excel_path, project_root, args.workers)
     success = converter.process_excel_file()
     
     if success:
@@ -21,6 +21,15 @@ const readYaml = (file) => {
   const raw = fs.readFileSync(file, 'utf8');
   return yaml.load(raw);
 };
+// Code fields hold JSON columns stored as real YAML mappings/sequences (see
+// scripts/column_types.py); render those back as pretty JSON text. String-only
+// lists are comma-split cells from older YAML and stay joined text.
+const isPlainObject = (v) =>
+  v !== null && typeof v === 'object' && Object.getPrototypeOf(v) === Object.prototype;
+const codeText = (v) => {
+  const isStructured = Array.isArray(v) ? v.some(x => typeof x !== 'string') : isPlainObject(v);
+  return isStructured ? JSON.stringify(v, null, 2) : v;
+};
 const asArray = (v) => Array.isArray(v) ? v : (v ? [v] : []);
 const fence = (lang, code) => '```' + (lang || '') + '\n' + (code || '') + '\n```';
 
@@ -77,15 +86,15 @@ const generateCleanMarkdownSections = (meta, sectionType) => {
       const value = meta[field];
       if (value !== undefined && value !== null && value !== '') {
         hasContent = true;
-        let displayValue = value;
+        // Check if this field should be formatted as code
+        const isCodeField = section.codeFields && section.codeFields.includes(field);
+        let displayValue = isCodeField ? codeText(value) : value;
         
         // Handle arrays
-        if (Array.isArray(value)) {
-          displayValue = value.join(', ');
+        if (Array.isArray(displayValue)) {
+          displayValue = displayValue.join(', ');
         }
         
-        // Check if this field should be formatted as code
-        const isCodeField = section.codeFields && section.codeFields.includes(field);
         const hasHeadingSyntax = typeof displayValue === 'string' && displayValue.includes('{') && displayValue.includes('}');
         
         if (isCodeField || hasHeadingSyntax) {
@@ -187,15 +196,15 @@ const generateMaterialUICSSSections = (meta, sectionType) => {
       const value = meta[field];
       if (value !== undefined && value !== null && value !== '') {
         hasContent = true;
-        let displayValue = value;
+        // Check if this field should be formatted as code
+        const isCodeField = section.codeFields && section.codeFields.includes(field);
+        let displayValue = isCodeField ? codeText(value) : value;
         
         // Handle arrays
-        if (Array.isArray(value)) {
-          displayValue = value.join(', ');
+        if (Array.isArray(displayValue)) {
+          displayValue = displayValue.join(', ');
         }
         
-        // Check if this field should be formatted as code
-        const isCodeField = section.codeFields && section.codeFields.includes(field);
         const hasHeadingSyntax = typeof displayValue === 'string' && displayValue.includes('{') && displayValue.includes('}');
         
         if (isCodeField || hasHeadingSyntax) {
@@ -266,15 +275,15 @@ const generateMaterialUISections = (meta, sectionType) => {
       const value = meta[field];
       if (value !== undefined && value !== null && value !== '') {
         hasContent = true;
-        let displayValue = value;
+        // Check if this field should be formatted as code
+        const isCodeField = section.codeFields && section.codeFields.includes(field);
+        let displayValue = isCodeField ? codeText(value) : value;
         
         // Handle arrays
-        if (Array.isArray(value)) {
-          displayValue = value.join(', ');
+        if (Array.isArray(displayValue)) {
+          displayValue = displayValue.join(', ');
         }
         
-        // Check if this field should be formatted as code
-        const isCodeField = section.codeFields && section.codeFields.includes(field);
         const hasHeadingSyntax = typeof displayValue === 'string' && displayValue.includes('{') && displayValue.includes('}');
         
         if (isCodeField || hasHeadingSyntax) {
@@ -345,15 +354,15 @@ const generateProfessionalSections = (meta, sectionType) => {
       const value = meta[field];
       if (value !== undefined && value !== null && value !== '') {
         hasContent = true;
-        let displayValue = value;
+        // Check if this field should be formatted as code
+        const isCodeField = section.codeFields && section.codeFields.includes(field);
+        let displayValue = isCodeField ? codeText(value) : value;
         
         // Handle arrays
-        if (Array.isArray(value)) {
-          displayValue = value.join(', ');
+        if (Array.isArray(displayValue)) {
+          displayValue = displayValue.join(', ');
         }
         
-        // Check if this field should be formatted as code
-        const isCodeField = section.codeFields && section.codeFields.includes(field);
         const hasHeadingSyntax = typeof displayValue === 'string' && displayValue.includes('{') && displayValue.includes('}');
         
         if (isCodeField || hasHeadingSyntax) {
@@ -44,6 +44,14 @@ const supabase = createClient(supabaseUrl, supabaseKey);
 
 console.log('🚀 Starting migration...\n');
 
+/**
+ * JSON columns may be stored as YAML mappings; keep them as JSON text in the database
+ */
+function asText(value) {
+  if (value === null || value === undefined) return null;
+  return typeof value === 'object' ? JSON.stringify(value, null, 2) : value;
+}
+
 /**
  * Convert slug from YAML filename
  */
@@ -119,8 +127,8 @@ async function importKPIs() {
           ga4_implementation: kpiData['GA Events Name'] || null,
           adobe_implementation: kpiData['Adobe Analytics Event Name'] || null,
           amplitude_implementation: kpiData['Amplitude Event Name'] || null,
-          data_layer_mapping: kpiData['Data Layer Mapping'] || null,
-          xdm_mapping: kpiData['XDM Mapping'] || null,
+          data_layer_mapping: asText(kpiData['Data Layer Mapping']),
+          xdm_mapping: asText(kpiData['XDM Mapping']),
           dependencies: kpiData.Dependencies || null,
           bi_source_system: biSourceSystem,
           report_attributes: reportAttributes,
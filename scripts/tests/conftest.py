@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Scripts are run directly (python scripts/...), so make them importable the same way
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,207 @@
+import io
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+import yaml
+
+import column_types
+from column_types import (
+    JSON, JSON5, LIST, SQL, TEXT, ColumnPipeline, clean_code_text, column_type,
+    dump_yaml, parse_blob,
+)
+
+DATA_LAYER = Path(__file__).resolve().parents[2] / 'data-layer'
+
+
+def excel_row(path: Path) -> dict:
+    """Rebuild the spreadsheet cells behind a generated YAML file"""
+    data = yaml.safe_load(path.read_text(encoding='utf-8'))
+    return {k: ', '.join(v) if isinstance(v, list) else v for k, v in data.items()}
+
+
+@pytest.fixture(scope='module')
+def orders():
+    return excel_row(DATA_LAYER / 'kpis' / 'orders.yml')
+
+
+@pytest.fixture(scope='module')
+def events():
+    return [excel_row(path) for path in sorted((DATA_LAYER / 'events').glob('*.yml'))]
+
+
+def test_column_type_lookup_ignores_naming_style():
+    assert column_type('Data Layer Mapping') == JSON5
+    assert column_type('data_layer_mapping') == JSON5
+    assert column_type('Dimensions (Related)') == LIST
+    assert column_type('dimensions_(related)') == LIST
+    assert column_type('SQL Query Example') == SQL
+    assert column_type('Description') == TEXT
+
+
+def test_json5_unquoted_dotted_keys_and_bare_values(events):
+    purchase = next(row for row in events if row['Event Name'] == 'purchase')
+    parsed = parse_blob((JSON5, purchase['Adobe XDM Map']))
+    assert parsed['commerce.order.purchaseID'] == 'order_id'
+    assert parsed['commerce.productListItems[].SKU'] == 'product_id'
+
+
+def test_json5_trailing_commas_and_single_quotes():
+    parsed = parse_blob((JSON5, "{ name: 'Tee', sizes: ['S', 'M',], price: 10.01, }"))
+    assert parsed == {'name': 'Tee', 'sizes': ['S', 'M'], 'price': 10.01}
+
+
+def test_json5_comments_keep_blob_as_text(orders):
+    parser = column_types._Json5Parser(clean_code_text(orders['Data Layer Mapping']))
+    assert parser.parse()['items'][0]['item_id'] == 'SKU_12345'
+    assert parser.has_comments
+
+    assert parse_blob((JSON5, orders['Data Layer Mapping'])) is None
+    assert parse_blob((JSON5, '{ /* note */ a: 1 }')) is None
+    row = ColumnPipeline(workers=1).convert_rows([orders])[0]
+    assert '// If someone purchases more than one item,' in row['Data Layer Mapping']
+
+
+def test_deeply_nested_blobs_fall_back_to_text():
+    assert parse_blob((JSON5, '{a:' * 3000)) is None
+    assert parse_blob((JSON, '[' * 100000)) is None
+    row = ColumnPipeline(workers=1).convert_rows([{'GA4 Params Map': '{a:' * 3000}])[0]
+    assert row['GA4 Params Map'] == '{a:' * 3000
+
+
+def test_json5_leading_zero_numbers_stay_strings():
+    assert parse_blob((JSON5, '{zip: 02134, count: 0, price: 0.5}')) == {
+        'zip': '02134', 'count': 0, 'price': 0.5,
+    }
+
+
+def test_json_columns_are_strict(events):
+    for row in events:
+        parsed = parse_blob((JSON, row['Example GA4 JSON']))
+        assert parsed['event_name'] == row['GA4 Event Name']
+
+    assert parse_blob((JSON, '{"zip": 02134}')) is None
+    assert parse_blob((JSON, '{"a": NaN}')) is None
+    assert parse_blob((JSON, '{a: 1}')) is None
+
+
+def test_invalid_blobs_fall_back_to_cleaned_text(orders):
+    # The KPI XDM Mapping cell is missing a closing brace
+    assert orders['XDM Mapping'].count('{') != orders['XDM Mapping'].count('}')
+    row = ColumnPipeline(workers=1).convert_rows([orders])[0]
+    assert row['XDM Mapping'] == clean_code_text(orders['XDM Mapping'])
+
+    # Dimension XDM mappings are plain field paths
+    row = ColumnPipeline(workers=1).convert_rows([{'XDM Mapping': '_experience.analytics.pageDetails.URL'}])[0]
+    assert row['XDM Mapping'] == '_experience.analytics.pageDetails.URL'
+
+
+def test_clean_code_text_strips_language_tag_and_br(orders):
+    sql = clean_code_text(orders['SQL Query Example'])
+    assert sql.startswith('SELECT COUNT(DISTINCT order_id) AS total_orders,\n')
+    assert '<br>' not in sql
+    assert clean_code_text('json { "a": 1 }') == '{ "a": 1 }'
+    assert clean_code_text('jsonb_agg(x)') == 'jsonb_agg(x)'
+
+
+def test_list_columns_split_and_text_columns_do_not(orders):
+    row = ColumnPipeline(workers=1).convert_rows([orders])[0]
+    assert row['Industry'] == ['Retail', 'eCommerce']
+    assert row['Related KPIs'][:2] == ['Revenue', 'Average Order Value (AOV)']
+    assert isinstance(row['Dashboard Usage'], str) and ',' in row['Dashboard Usage']
+    assert isinstance(row['Segment Eligibility'], str)
+    assert isinstance(row['SQL Query Example'], str)
+    assert row['Formula'] == 'Orders = COUNT(DISTINCT order_id)'
+
+
+class CountingExecutor(ProcessPoolExecutor):
+    instances = 0
+    items = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingExecutor.instances += 1
+
+    def map(self, fn, items, **kwargs):
+        CountingExecutor.items.extend(items)
+        return super().map(fn, items, **kwargs)
+
+
+@pytest.fixture
+def counting_pool(monkeypatch):
+    CountingExecutor.instances = 0
+    CountingExecutor.items = []
+    monkeypatch.setattr(column_types, 'POOL_MIN_BYTES', 0)
+    monkeypatch.setattr(column_types, 'ProcessPoolExecutor', CountingExecutor)
+    return CountingExecutor
+
+
+def test_pool_and_serial_paths_match(orders, events, counting_pool, caplog):
+    rows = [orders] + events
+    serial = ColumnPipeline(workers=1).convert_rows(rows)
+    with ColumnPipeline(workers=2) as pipeline:
+        pooled = pipeline.convert_rows(rows)
+    assert pooled == serial
+    assert counting_pool.instances == 1
+    assert counting_pool.items
+    assert 'Process pool unavailable' not in caplog.text
+
+
+def test_pool_only_gets_json5_and_is_reused_across_sheets(orders, events, counting_pool):
+    with ColumnPipeline(workers=2) as pipeline:
+        pipeline.convert_rows(events)
+        pipeline.convert_rows([orders])
+    assert counting_pool.instances == 1
+    assert {kind for kind, _ in counting_pool.items} == {JSON5}
+
+
+def test_small_batches_stay_serial(events, counting_pool, monkeypatch):
+    monkeypatch.setattr(column_types, 'POOL_MIN_BYTES', 10 ** 9)
+    with ColumnPipeline(workers=2) as pipeline:
+        pipeline.convert_rows(events)
+    assert counting_pool.instances == 0
+
+
+def test_broken_pool_falls_back_to_serial(orders, events, monkeypatch):
+    class BrokenExecutor:
+        def __init__(self, *args, **kwargs):
+            raise BrokenProcessPool('no workers')
+
+    monkeypatch.setattr(column_types, 'POOL_MIN_BYTES', 0)
+    monkeypatch.setattr(column_types, 'ProcessPoolExecutor', BrokenExecutor)
+    rows = [orders] + events
+    pipeline = ColumnPipeline(workers=2)
+    assert pipeline.convert_rows(rows) == ColumnPipeline(workers=1).convert_rows(rows)
+    assert pipeline.workers == 1
+
+
+def test_repeated_blobs_are_parsed_once(events, monkeypatch):
+    calls = []
+    monkeypatch.setattr(column_types, 'parse_blob', lambda item: calls.append(item) or {})
+    pipeline = ColumnPipeline(workers=1)
+    pipeline.convert_rows(events * 3)
+    pipeline.convert_rows(events)
+    assert calls
+    assert len(calls) == len(set(calls))
+
+
+def test_dump_yaml_writes_block_literals(orders):
+    row = ColumnPipeline(workers=1).convert_rows([orders])[0]
+    stream = io.StringIO()
+    dump_yaml(row, stream)
+    text = stream.getvalue()
+    assert 'SQL Query Example: |' in text
+    assert 'XDM Mapping: |' in text
+    assert 'Data Layer Mapping: |' in text
+    assert yaml.safe_load(text) == row
+
+
+def test_dump_yaml_writes_parsed_blobs_as_mappings(events):
+    row = ColumnPipeline(workers=1).convert_rows(events[:1] * 2)[0]
+    stream = io.StringIO()
+    dump_yaml(row, stream)
+    text = stream.getvalue()
+    assert 'GA4 Params Map:\n  items:\n' in text
+    assert '&id' not in text
+    assert yaml.safe_load(text) == row